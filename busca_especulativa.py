@@ -0,0 +1,222 @@
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# ============================================================
+# CONFIGURAÇÕES DA BUSCA ESPECULATIVA
+# ============================================================
+
+# Modo especulativo: dispara o GitHub junto com o LinkedIn em vez de esperar a falha
+MODO_ESPECULATIVO = False
+# 'linkedin' = LinkedIn sempre que der certo (GitHub fica pronto como reserva)
+# 'prazo'    = LinkedIn se der certo em até PRAZO_LINKEDIN segundos, senão GitHub
+# 'primeiro' = a primeira foto válida que chegar
+PREFERENCIA_FONTE = 'prazo'
+PRAZO_LINKEDIN = 15  # Contado a partir do início real da tentativa do LinkedIn
+
+EXECUTOR_GITHUB = ThreadPoolExecutor(max_workers=4)
+
+# ============================================================
+# CANAL DO LINKEDIN (UMA TENTATIVA POR VEZ, COM PAUSA)
+# ============================================================
+
+def criar_canal(pausa):
+    """Executor de 1 thread que espera `pausa` segundos entre tentativas"""
+    return {
+        'executor': ThreadPoolExecutor(max_workers=1),
+        'pausa': pausa,
+        'ultimo_fim': 0.0,
+        'pendente': None,
+    }
+
+
+def canal_ocupado(canal):
+    """True se ainda há uma tentativa (ex: abandonada) rodando no canal"""
+    pendente = canal['pendente']
+    return pendente is not None and not pendente.done()
+
+
+def executar_no_canal(canal, tarefa):
+    """Agenda a tarefa no canal; a pausa é contada a partir do fim da anterior"""
+    def executar():
+        espera = canal['pausa'] - (time.time() - canal['ultimo_fim'])
+        if espera > 0:
+            time.sleep(espera)
+        try:
+            return tarefa()
+        finally:
+            canal['ultimo_fim'] = time.time()
+
+    futuro = canal['executor'].submit(executar)
+    canal['pendente'] = futuro
+    return futuro
+
+
+def aguardar_canal(canal):
+    """Espera a tentativa em andamento no canal (ex: uma abandonada) terminar"""
+    pendente = canal['pendente']
+    if pendente is not None:
+        wait([pendente])
+
+
+def encerrar_canal(canal):
+    """Espera a tentativa em andamento terminar e libera o executor"""
+    canal['executor'].shutdown(wait=True)
+
+# ============================================================
+# ARQUIVOS DAS FOTOS
+# ============================================================
+
+FONTES = ('linkedin', 'github')
+_tentativas = itertools.count(1)
+
+def remover_arquivo(caminho):
+    """Remove o arquivo se existir"""
+    try:
+        if os.path.exists(caminho):
+            os.remove(caminho)
+    except OSError as e:
+        print(f"    ⚠️  Não foi possível remover {caminho}: {e}")
+
+
+def caminho_tentativa(destino, fonte):
+    """Nome temporário único para uma tentativa (nunca colide com outra tentativa)"""
+    base = os.path.splitext(destino)[0]
+    return f"{base}_{fonte}_{os.getpid()}_{next(_tentativas)}.part"
+
+
+def promover_foto(temporario, destino):
+    """Move a foto baixada para o caminho final da pessoa e apaga variantes
+    antigas (_linkedin.jpg / _github.jpg). Retorna False se não conseguiu mover"""
+    try:
+        os.replace(temporario, destino)
+    except OSError as e:
+        print(f"    ❌ Não foi possível salvar {destino}: {e}")
+        return False
+
+    base = os.path.splitext(destino)[0]
+    for fonte in FONTES:
+        remover_arquivo(f"{base}_{fonte}.jpg")
+    return True
+
+
+def baixar_para(destino, fonte, tarefa):
+    """Roda tarefa(caminho_temporario) e, se der certo, promove a foto para destino"""
+    temporario = caminho_tentativa(destino, fonte)
+    if tarefa(temporario) and promover_foto(temporario, destino):
+        return True
+    remover_arquivo(temporario)
+    return False
+
+# ============================================================
+# DISPUTA ENTRE AS FONTES
+# ============================================================
+
+def disputar_fontes(canal, tarefa_linkedin, tarefa_github, destino,
+                    ao_atualizar_economia=None, preferencia=None, prazo_linkedin=None):
+    """Roda LinkedIn e GitHub ao mesmo tempo e escolhe a foto pela preferência.
+
+    As tarefas recebem o caminho temporário onde devem gravar a foto; a
+    vencedora é movida para `destino` e a temporária da perdedora é apagada
+    quando a tentativa dela terminar. Retorna (origem, segundos economizados
+    em relação ao modo sequencial).
+
+    Se o LinkedIn for abandonado, a economia só é conhecida quando ele
+    terminar: ao_atualizar_economia(economia, exata) é chamada na hora com
+    um valor mínimo (exata=False) e de novo com o valor final."""
+    preferencia = preferencia or PREFERENCIA_FONTE
+    prazo_linkedin = PRAZO_LINKEDIN if prazo_linkedin is None else prazo_linkedin
+
+    # Tentativa anterior do LinkedIn ainda rodando: não enfileira outra
+    if canal_ocupado(canal):
+        print("   ⏳ LinkedIn ainda ocupado com a tentativa anterior, usando só o GitHub")
+        origem = 'github' if baixar_para(destino, 'github', tarefa_github) else "nenhum"
+        if ao_atualizar_economia:
+            ao_atualizar_economia(0.0, True)
+        return origem, 0.0
+
+    envio = time.time()
+    arquivos = {fonte: caminho_tentativa(destino, fonte) for fonte in FONTES}
+    inicios = {}
+    tempos = {}
+    estado = {}
+    trava = threading.Lock()
+    linkedin_comecou = threading.Event()
+
+    def cronometrar(fonte, tarefa):
+        inicios[fonte] = time.time()
+        if fonte == 'linkedin':
+            linkedin_comecou.set()
+        try:
+            return tarefa(arquivos[fonte])
+        except Exception as e:
+            print(f"    ❌ Erro {fonte}: {e}")
+            return False
+        finally:
+            # Roda dentro da tarefa: quem espera o canal já vê a economia final
+            with trava:
+                tempos[fonte] = time.time() - inicios[fonte]
+                ao_terminar = estado.get('ao_terminar_linkedin') if fonte == 'linkedin' else None
+            if ao_terminar:
+                ao_terminar()
+
+    futuro_linkedin = executar_no_canal(canal, lambda: cronometrar('linkedin', tarefa_linkedin))
+    futuro_github = EXECUTOR_GITHUB.submit(cronometrar, 'github', tarefa_github)
+    fontes = {futuro_linkedin: 'linkedin', futuro_github: 'github'}
+
+    # Fase 1: só o LinkedIn conta até o prazo (que começa depois da pausa do canal)
+    if preferencia != 'primeiro':
+        limite = None if preferencia == 'linkedin' else prazo_linkedin
+        while not linkedin_comecou.wait(0.1) and not futuro_linkedin.done():
+            pass
+        wait([futuro_linkedin], timeout=limite)
+
+    # Fase 2: vale a primeira foto válida (LinkedIn ganha empates)
+    vencedor = None
+    pendentes = {futuro_linkedin, futuro_github}
+    while pendentes and not vencedor:
+        prontos = {f for f in pendentes if f.done()}
+        if not prontos:
+            prontos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+        pendentes -= prontos
+        for futuro in sorted(prontos, key=lambda f: fontes[f] != 'linkedin'):
+            if futuro.result():
+                vencedor = fontes[futuro]
+                break
+
+    if vencedor and not promover_foto(arquivos[vencedor], destino):
+        vencedor = None
+
+    # Temporárias das perdedoras são apagadas quando cada tentativa terminar
+    for futuro, fonte in fontes.items():
+        if fonte != vencedor:
+            futuro.add_done_callback(lambda _, caminho=arquivos[fonte]: remover_arquivo(caminho))
+
+    with trava:
+        agora = time.time()
+        inicio = inicios.get('linkedin', envio)
+
+        def calcular(tempo_linkedin):
+            # Sequencial: LinkedIn inteiro + GitHub quando o LinkedIn não resolveu
+            sequencial = tempo_linkedin
+            if vencedor != 'linkedin':
+                sequencial += tempos.get('github', 0)
+            return max(sequencial - (agora - inicio), 0)
+
+        if 'linkedin' in tempos:
+            economia = calcular(tempos['linkedin'])
+            exata = True
+        else:
+            # LinkedIn abandonado: por enquanto, só o que ele já rodou
+            economia = calcular(agora - inicios['linkedin'] if 'linkedin' in inicios else 0)
+            exata = False
+            if ao_atualizar_economia:
+                estado['ao_terminar_linkedin'] = (
+                    lambda: ao_atualizar_economia(calcular(tempos['linkedin']), True))
+
+        if ao_atualizar_economia:
+            ao_atualizar_economia(economia, exata)
+
+    return vencedor or "nenhum", economia
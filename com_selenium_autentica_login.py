@@ -2,26 +2,56 @@ import requests
 import csv
 import os
 import time
+import threading
+import weakref
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from busca_especulativa import (
+    MODO_ESPECULATIVO,
+    PREFERENCIA_FONTE,
+    criar_canal,
+    executar_no_canal,
+    encerrar_canal,
+    baixar_para,
+    disputar_fontes,
+)
 
 # ============================================================
 # CONFIGURAÇÕES ROBUSTAS
 # ============================================================
 
-CHROME_OPTIONS = Options()
-# CHROME_OPTIONS.add_argument('--headless=new')  # Mantenha comentado para ver o navegador
-CHROME_OPTIONS.add_argument('--no-sandbox')
-CHROME_OPTIONS.add_argument('--disable-dev-shm-usage')
-CHROME_OPTIONS.add_argument('--disable-blink-features=AutomationControlled')
-CHROME_OPTIONS.add_experimental_option("excludeSwitches", ["enable-automation"])
-CHROME_OPTIONS.add_experimental_option('useAutomationExtension', False)
-CHROME_OPTIONS.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-CHROME_OPTIONS.add_argument('--start-maximized')
+def criar_opcoes_chrome(pasta_perfil=None):
+    """Monta as opções do Chrome (pasta_perfil mantém cookies/login entre execuções)"""
+    opcoes = Options()
+    # opcoes.add_argument('--headless=new')  # Mantenha comentado para ver o navegador
+    opcoes.add_argument('--no-sandbox')
+    opcoes.add_argument('--disable-dev-shm-usage')
+    opcoes.add_argument('--disable-blink-features=AutomationControlled')
+    opcoes.add_experimental_option("excludeSwitches", ["enable-automation"])
+    opcoes.add_experimental_option('useAutomationExtension', False)
+    opcoes.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+    opcoes.add_argument('--start-maximized')
+    if pasta_perfil:
+        opcoes.add_argument(f'--user-data-dir={os.path.abspath(pasta_perfil)}')
+    return opcoes
+
+CHROME_OPTIONS = criar_opcoes_chrome()
+
+# Uma sessão HTTP por thread: reaproveita conexões (keep-alive) entre downloads
+_sessoes_http = threading.local()
+
+def sessao_http():
+    """Sessão requests da thread atual (criada no primeiro uso)"""
+    if not hasattr(_sessoes_http, 'sessao'):
+        _sessoes_http.sessao = requests.Session()
+    return _sessoes_http.sessao
+
+# Intervalo mínimo entre o fim de um perfil do LinkedIn e o início do próximo
+PAUSA_ENTRE_LINKEDIN = 5
 
 # ============================================================
 # FUNÇÕES AUXILIARES ROBUSTAS
@@ -62,7 +92,7 @@ def baixar_imagem_super_robusta(url, nome_arquivo):
         if 'linkedin.com' in url:
             headers['Referer'] = 'https://www.linkedin.com/'
         
-        resposta = requests.get(url, headers=headers, timeout=20, stream=True)
+        resposta = sessao_http().get(url, headers=headers, timeout=20, stream=True)
         
         if resposta.status_code == 200:
             # Verifica se é realmente uma imagem
@@ -110,7 +140,7 @@ def extrair_username_github(url):
     except:
         return None
 
-def baixar_foto_github_super(url_github, nome_pessoa):
+def baixar_foto_github_super(url_github, nome_pessoa, nome_arquivo=None):
     """Baixa foto do GitHub com múltiplas tentativas"""
     try:
         if not url_github or not url_github.startswith('http'):
@@ -122,8 +152,9 @@ def baixar_foto_github_super(url_github, nome_pessoa):
             return False
         
         # Nome do arquivo seguro
-        nome_seguro = limpar_nome_arquivo(nome_pessoa.replace(' ', '_'))
-        nome_arquivo = f"fotos/{nome_seguro}_github.jpg"
+        if not nome_arquivo:
+            nome_seguro = limpar_nome_arquivo(nome_pessoa.replace(' ', '_'))
+            nome_arquivo = f"fotos/{nome_seguro}_github.jpg"
         
         # Múltiplas URLs para tentar
         urls_tentativas = [
@@ -149,11 +180,12 @@ def baixar_foto_github_super(url_github, nome_pessoa):
 # SELENIUM ROBUSTO
 # ============================================================
 
-def inicializar_selenium_robusto():
+def inicializar_selenium_robusto(pasta_perfil=None):
     """Inicializa Selenium com tratamento de erro robusto"""
     try:
         print("🚀 Inicializando navegador...")
-        driver = webdriver.Chrome(options=CHROME_OPTIONS)
+        opcoes = criar_opcoes_chrome(pasta_perfil) if pasta_perfil else CHROME_OPTIONS
+        driver = webdriver.Chrome(options=opcoes)
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
         driver.implicitly_wait(10)
         print("✅ Navegador inicializado com sucesso")
@@ -173,6 +205,16 @@ def verificar_sessao_ativa(driver):
     except WebDriverException:
         return False
 
+def linkedin_logado(driver):
+    """Verifica se o navegador já tem uma sessão do LinkedIn (ex: perfil salvo)"""
+    try:
+        driver.get("https://www.linkedin.com/feed/")
+        time.sleep(3)
+        url_atual = driver.current_url
+        return "login" not in url_atual and "authwall" not in url_atual
+    except WebDriverException:
+        return False
+
 def fazer_login_linkedin_robusto(driver):
     """Faz login manual com verificações robustas"""
     print("\n🔐 INSTRUÇÕES DE LOGIN NO LINKEDIN:")
@@ -261,8 +303,12 @@ def deslogar_linkedin_seguro(driver):
 # DOWNLOAD LINKEDIN COM SELENIUM
 # ============================================================
 
-def baixar_foto_linkedin_com_selenium(url_linkedin, nome_pessoa, driver):
+def baixar_foto_linkedin_com_selenium(url_linkedin, nome_pessoa, driver, nome_arquivo=None):
     """Baixa foto do LinkedIn usando Selenium de forma robusta"""
+    if not nome_arquivo:
+        nome_seguro = limpar_nome_arquivo(nome_pessoa.replace(' ', '_'))
+        nome_arquivo = f"fotos/{nome_seguro}_linkedin.jpg"
+    
     if not verificar_sessao_ativa(driver):
         print("    ❌ Sessão do navegador fechada")
         return False
@@ -297,8 +343,6 @@ def baixar_foto_linkedin_com_selenium(url_linkedin, nome_pessoa, driver):
                 
                 if src and src.startswith('http') and 'blank' not in src.lower():
                     print(f"    ✅ Encontrado com: {selector}")
-                    nome_seguro = limpar_nome_arquivo(nome_pessoa.replace(' ', '_'))
-                    nome_arquivo = f"fotos/{nome_seguro}_linkedin.jpg"
                     
                     # Tenta melhorar a qualidade
                     if 'media.licdn.com' in src:
@@ -324,8 +368,6 @@ def baixar_foto_linkedin_com_selenium(url_linkedin, nome_pessoa, driver):
                     fim = style.find('")', inicio)
                     if inicio > 4 and fim > inicio:
                         src = style[inicio:fim]
-                        nome_seguro = limpar_nome_arquivo(nome_pessoa.replace(' ', '_'))
-                        nome_arquivo = f"fotos/{nome_seguro}_linkedin.jpg"
                         print(f"    ✅ Background image encontrada")
                         return baixar_imagem_super_robusta(src, nome_arquivo)
             except NoSuchElementException:
@@ -338,10 +380,141 @@ def baixar_foto_linkedin_com_selenium(url_linkedin, nome_pessoa, driver):
         print(f"    ❌ Erro no LinkedIn: {e}")
         return False
 
+# ============================================================
+# CANAL DO LINKEDIN POR NAVEGADOR
+# ============================================================
+
+_canais_linkedin = weakref.WeakKeyDictionary()
+_canais_lock = threading.Lock()
+
+def canal_linkedin(driver):
+    """Um canal (executor de 1 thread + pausa) por navegador: o Selenium nunca é usado em paralelo"""
+    with _canais_lock:
+        canal = _canais_linkedin.get(driver)
+        if canal is None:
+            canal = criar_canal(PAUSA_ENTRE_LINKEDIN)
+            _canais_linkedin[driver] = canal
+        return canal
+
+def aguardar_linkedin_pendente(driver):
+    """Espera tentativas do LinkedIn em andamento antes de fechar/reciclar o navegador"""
+    with _canais_lock:
+        canal = _canais_linkedin.pop(driver, None)
+    if canal:
+        encerrar_canal(canal)
+
 # ============================================================
 # PROCESSAMENTO PRINCIPAL SUPER ROBUSTO
 # ============================================================
 
+def ler_pessoas(linhas):
+    """Converte as linhas do CSV (nome,linkedin,github) em lista de pessoas"""
+    # Processa cabeçalho
+    cabecalho = linhas[0].strip().split(',')
+    print(f"📋 Cabeçalho: {cabecalho}")
+    
+    # Encontra colunas
+    indice_nome = next((i for i, c in enumerate(cabecalho) if 'nome' in c.lower()), None)
+    indice_linkedin = next((i for i, c in enumerate(cabecalho) if 'linkedin' in c.lower()), None)
+    indice_github = next((i for i, c in enumerate(cabecalho) if 'github' in c.lower()), None)
+    
+    # Processa pessoas
+    pessoas = []
+    for linha in linhas[1:]:
+        if not linha.strip():
+            continue
+            
+        dados = linha.strip().split(',')
+        nome = dados[indice_nome] if indice_nome is not None and len(dados) > indice_nome else ""
+        linkedin = dados[indice_linkedin] if indice_linkedin is not None and len(dados) > indice_linkedin else ""
+        github = dados[indice_github] if indice_github is not None and len(dados) > indice_github else ""
+        
+        if nome.strip():
+            pessoas.append({
+                'nome': nome.strip(),
+                'linkedin': linkedin.strip(),
+                'github': github.strip()
+            })
+    
+    return pessoas
+
+def processar_pessoa(pessoa, driver, usar_linkedin, especulativo=None):
+    """Tenta LinkedIn e depois GitHub para uma pessoa e retorna o resultado"""
+    nome = pessoa['nome']
+    linkedin = pessoa['linkedin']
+    github = pessoa['github']
+    if especulativo is None:
+        especulativo = MODO_ESPECULATIVO
+    
+    print(f"   📧 LinkedIn: {'Sim' if linkedin.startswith('http') else 'Não'}")
+    print(f"   💻 GitHub: {'Sim' if github.startswith('http') else 'Não'}")
+    
+    # Caminho final da foto, igual nos dois modos (cada tentativa grava num temporário)
+    destino = f"fotos/{limpar_nome_arquivo(nome.replace(' ', '_'))}.jpg"
+    
+    # Com as duas fontes disponíveis, o modo especulativo dispara ambas juntas
+    if especulativo and usar_linkedin and linkedin.startswith('http') and github.startswith('http'):
+        print(f"   ⚡ Buscando LinkedIn e GitHub em paralelo (preferência: {PREFERENCIA_FONTE})...")
+        resultado = {'nome': nome, 'origem': "nenhum", 'sucesso': 'nao', 'tempo_economizado': "0.0"}
+        
+        def atualizar_economia(economia, exata):
+            # Enquanto um LinkedIn abandonado roda, o valor é só um mínimo (">=")
+            resultado['tempo_economizado'] = f"{economia:.1f}" if exata else f">={economia:.1f}"
+        
+        origem, economia = disputar_fontes(
+            canal_linkedin(driver),
+            lambda caminho: baixar_foto_linkedin_com_selenium(linkedin, nome, driver, caminho),
+            lambda caminho: baixar_foto_github_super(github, nome, caminho),
+            destino,
+            atualizar_economia,
+        )
+        sucesso = origem != "nenhum"
+        status = "✅" if sucesso else "❌"
+        print(f"   {status} Resultado: {origem} (economia: {resultado['tempo_economizado']}s)")
+        
+        resultado['origem'] = origem
+        resultado['sucesso'] = 'sim' if sucesso else 'nao'
+        return resultado
+    
+    sucesso = False
+    origem = "nenhum"
+    
+    # Tenta LinkedIn primeiro (se disponível), pelo canal do navegador
+    if not sucesso and usar_linkedin and linkedin.startswith('http'):
+        print("   🎯 Tentando LinkedIn...")
+        tentativa = executar_no_canal(
+            canal_linkedin(driver),
+            lambda: baixar_para(destino, 'linkedin',
+                                lambda caminho: baixar_foto_linkedin_com_selenium(linkedin, nome, driver, caminho)),
+        )
+        if tentativa.result():
+            sucesso = True
+            origem = "linkedin"
+        else:
+            print("   ❌ LinkedIn falhou")
+    
+    # Tenta GitHub (sempre disponível)
+    if not sucesso and github.startswith('http'):
+        print("   🔄 Tentando GitHub...")
+        if baixar_para(destino, 'github', lambda caminho: baixar_foto_github_super(github, nome, caminho)):
+            sucesso = True
+            origem = "github"
+        else:
+            print("   ❌ GitHub falhou")
+    
+    # Resultado
+    status = "✅" if sucesso else "❌"
+    print(f"   {status} Resultado: {origem}")
+    
+    resultado = {
+        'nome': nome,
+        'origem': origem,
+        'sucesso': 'sim' if sucesso else 'nao'
+    }
+    if especulativo:
+        resultado['tempo_economizado'] = "0.0"
+    return resultado
+
 def processar_csv_super_robusto():
     """Processa o CSV com máxima robustez"""
     
@@ -357,32 +530,7 @@ def processar_csv_super_robusto():
         with open('pessoas.csv', 'r', encoding='utf-8') as arquivo:
             linhas = arquivo.readlines()
         
-        # Processa cabeçalho
-        cabecalho = linhas[0].strip().split(',')
-        print(f"📋 Cabeçalho: {cabecalho}")
-        
-        # Encontra colunas
-        indice_nome = next((i for i, c in enumerate(cabecalho) if 'nome' in c.lower()), None)
-        indice_linkedin = next((i for i, c in enumerate(cabecalho) if 'linkedin' in c.lower()), None)
-        indice_github = next((i for i, c in enumerate(cabecalho) if 'github' in c.lower()), None)
-        
-        # Processa pessoas
-        pessoas = []
-        for linha in linhas[1:]:
-            if not linha.strip():
-                continue
-                
-            dados = linha.strip().split(',')
-            nome = dados[indice_nome] if indice_nome is not None and len(dados) > indice_nome else ""
-            linkedin = dados[indice_linkedin] if indice_linkedin is not None and len(dados) > indice_linkedin else ""
-            github = dados[indice_github] if indice_github is not None and len(dados) > indice_github else ""
-            
-            if nome.strip():
-                pessoas.append({
-                    'nome': nome.strip(),
-                    'linkedin': linkedin.strip(),
-                    'github': github.strip()
-                })
+        pessoas = ler_pessoas(linhas)
         
         if not pessoas:
             print("❌ Nenhuma pessoa encontrada no CSV")
@@ -405,54 +553,24 @@ def processar_csv_super_robusto():
         
         # PROCESSAMENTO DE CADA PESSOA
         for i, pessoa in enumerate(pessoas, 1):
-            nome = pessoa['nome']
-            linkedin = pessoa['linkedin']
-            github = pessoa['github']
-            
-            print(f"\n🔹 {i}/{len(pessoas)} - {nome}")
-            print(f"   📧 LinkedIn: {'Sim' if linkedin.startswith('http') else 'Não'}")
-            print(f"   💻 GitHub: {'Sim' if github.startswith('http') else 'Não'}")
-            
-            sucesso = False
-            origem = "nenhum"
-            
-            # Tenta LinkedIn primeiro (se disponível)
-            if not sucesso and precisa_linkedin and linkedin.startswith('http'):
-                print("   🎯 Tentando LinkedIn...")
-                if baixar_foto_linkedin_com_selenium(linkedin, nome, driver):
-                    sucesso = True
-                    origem = "linkedin"
-                else:
-                    print("   ❌ LinkedIn falhou")
-            
-            # Tenta GitHub (sempre disponível)
-            if not sucesso and github.startswith('http'):
-                print("   🔄 Tentando GitHub...")
-                if baixar_foto_github_super(github, nome):
-                    sucesso = True
-                    origem = "github"
-                else:
-                    print("   ❌ GitHub falhou")
-            
-            # Resultado
-            status = "✅" if sucesso else "❌"
-            print(f"   {status} Resultado: {origem}")
-            
-            resultados.append({
-                'nome': nome,
-                'origem': origem,
-                'sucesso': 'sim' if sucesso else 'nao'
-            })
+            print(f"\n🔹 {i}/{len(pessoas)} - {pessoa['nome']}")
+            resultados.append(processar_pessoa(pessoa, driver, precisa_linkedin))
             
             # Pausa estratégica
             if i < len(pessoas):
                 print("   ⏳ Aguardando 5 segundos...")
                 time.sleep(5)
         
+        # Tentativa do LinkedIn abandonada ainda rodando: espera para gravar a economia final
+        if driver:
+            aguardar_linkedin_pendente(driver)
+        
         # SALVA RESULTADOS
         try:
             with open('resultado.csv', 'w', newline='', encoding='utf-8') as arquivo:
                 campos = ['nome', 'origem', 'sucesso']
+                if MODO_ESPECULATIVO:
+                    campos.append('tempo_economizado')
                 escritor = csv.DictWriter(arquivo, fieldnames=campos)
                 escritor.writeheader()
                 escritor.writerows(resultados)
@@ -469,6 +587,8 @@ def processar_csv_super_robusto():
     
     finally:
         # LIMPEZA FINAL
+        if driver:
+            aguardar_linkedin_pendente(driver)
         if driver and verificar_sessao_ativa(driver):
             print("\n🔓 Finalizando sessão...")
             deslogar_linkedin_seguro(driver)
@@ -497,7 +617,7 @@ if __name__ == "__main__":
     # Verifica arquivo
     if not os.path.exists('pessoas.csv'):
         print("❌ Arquivo 'pessoas.csv' não encontrado")
-        print("   Crie um arquivo CSV com colunas: nome,linkedin,github")
+        print("   Crie um arquivo CSV com colunas: nome,linkedin,github,turma")
         exit(1)
     
     # Executa
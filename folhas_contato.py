@@ -0,0 +1,310 @@
+import csv
+import hashlib
+import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageOps
+
+# ============================================================
+# CONFIGURAÇÕES
+# ============================================================
+
+PASTA_FOTOS = 'fotos'
+PASTA_FOLHAS = 'folhas'
+ARQUIVO_TURMAS = 'turmas.md'
+ARQUIVO_PESSOAS = 'pessoas.csv'
+
+TAMANHO_BLOCO = 160   # Lado de cada foto na folha (pixels)
+COLUNAS = 8           # Fotos por linha da folha
+COR_FUNDO = 255       # Fundo branco
+
+# Os scripts de download gravam só o caminho normal; as variantes com sufixo
+# vêm de execuções antigas e são apagadas quando uma foto nova é salva
+SUFIXOS_FOTO = ['.jpg', '_linkedin.jpg', '_github.jpg']
+
+# ============================================================
+# FUNÇÕES AUXILIARES
+# ============================================================
+
+def criar_pasta(nome):
+    """Cria pasta se não existir"""
+    if not os.path.exists(nome):
+        os.makedirs(nome)
+
+
+def limpar_nome_arquivo(nome):
+    """Remove caracteres inválidos para nome de arquivo"""
+    caracteres_invalidos = ['<', '>', ':', '"', '/', '\\', '|', '?', '*']
+    for char in caracteres_invalidos:
+        nome = nome.replace(char, '_')
+    return nome[:100]
+
+
+def ler_turmas(caminho=ARQUIVO_TURMAS):
+    """Lê os códigos das turmas do turmas.md (uma por linha, ex: '139-')"""
+    turmas = []
+    if not os.path.exists(caminho):
+        return turmas
+
+    with open(caminho, 'r', encoding='utf-8') as arquivo:
+        for linha in arquivo:
+            codigo = linha.strip().lstrip('-*# ').rstrip('-').strip()
+            if codigo and codigo not in turmas:
+                turmas.append(codigo)
+    return turmas
+
+
+def ler_membros_por_turma(caminho=ARQUIVO_PESSOAS):
+    """Agrupa os nomes do CSV pela coluna 'turma'"""
+    membros = {}
+    with open(caminho, 'r', encoding='utf-8') as arquivo:
+        for pessoa in csv.DictReader(arquivo):
+            nome = (pessoa.get('nome') or '').strip()
+            turma = (pessoa.get('turma') or '').strip().rstrip('-').strip()
+            if nome and turma:
+                membros.setdefault(turma, []).append(nome)
+    return membros
+
+
+def localizar_foto(nome):
+    """Procura a foto baixada da pessoa em fotos/ (padrão, LinkedIn, GitHub)"""
+    bases = [nome.replace(' ', '_'), limpar_nome_arquivo(nome.replace(' ', '_'))]
+    for sufixo in SUFIXOS_FOTO:
+        for base in bases:
+            caminho = os.path.join(PASTA_FOTOS, base + sufixo)
+            if os.path.exists(caminho):
+                return caminho
+    return None
+
+
+def hash_arquivo(caminho):
+    """SHA-256 do conteúdo do arquivo"""
+    resumo = hashlib.sha256()
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(65536), b''):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+
+def assinatura_foto(caminho, anterior=None):
+    """Hash do conteúdo da foto; só relê o arquivo se tamanho ou data mudaram"""
+    info = os.stat(caminho)
+    if (anterior and anterior.get('tamanho') == info.st_size
+            and anterior.get('mtime_ns') == info.st_mtime_ns and anterior.get('hash')):
+        return anterior
+    return {'tamanho': info.st_size, 'mtime_ns': info.st_mtime_ns, 'hash': hash_arquivo(caminho)}
+
+# ============================================================
+# DESENHO DOS BLOCOS (roda nos processos do pool)
+# ============================================================
+
+def cabecalho_ppm(largura, altura):
+    """Cabeçalho do PPM binário usado como buffer da folha"""
+    return f"P6\n{largura} {altura}\n255\n".encode('ascii')
+
+
+def desenhar_bloco(tarefa):
+    """Decodifica, redimensiona e grava uma foto direto no buffer mapeado"""
+    caminho_foto, caminho_buffer, largura, altura, x, y, lado = tarefa
+    try:
+        with Image.open(caminho_foto) as imagem:
+            # draft() faz o JPEG ser decodificado já reduzido (1/2, 1/4, 1/8),
+            # evitando decodificar a foto inteira em tamanho original
+            imagem.draft('RGB', (lado, lado))
+            imagem = ImageOps.fit(imagem.convert('RGB'), (lado, lado))
+            pixels = imagem.tobytes()
+
+        deslocamento = len(cabecalho_ppm(largura, altura))
+        bytes_linha = lado * 3
+        with open(caminho_buffer, 'r+b') as arquivo:
+            with mmap.mmap(arquivo.fileno(), 0) as buffer:
+                for linha in range(lado):
+                    inicio = deslocamento + ((y + linha) * largura + x) * 3
+                    origem = linha * bytes_linha
+                    buffer[inicio:inicio + bytes_linha] = pixels[origem:origem + bytes_linha]
+        return True
+
+    except Exception as e:
+        print(f"    ❌ Erro ao processar {caminho_foto}: {e}")
+        return False
+
+# ============================================================
+# GERAÇÃO DAS FOLHAS
+# ============================================================
+
+def ler_indice(turma):
+    """Lê o índice JSON da última folha gerada (None se não houver folha)"""
+    caminho_indice = os.path.join(PASTA_FOLHAS, f"turma_{turma}.json")
+    caminho_folha = os.path.join(PASTA_FOLHAS, f"turma_{turma}.png")
+    if not os.path.exists(caminho_indice) or not os.path.exists(caminho_folha):
+        return None
+
+    try:
+        with open(caminho_indice, 'r', encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+
+
+def precisa_regerar(indice, assinaturas):
+    """Só regera a folha se o conteúdo de alguma foto (ou os membros) mudou"""
+    if not indice:
+        return True
+
+    anteriores = indice.get('assinaturas') or {}
+    return (indice.get('tamanho_bloco') != TAMANHO_BLOCO
+            or indice.get('colunas') != COLUNAS
+            or {nome: (a or {}).get('hash') for nome, a in anteriores.items()}
+            != {nome: a['hash'] for nome, a in assinaturas.items()})
+
+
+def salvar_indice(turma, indice):
+    """Grava o índice JSON nome -> posição da folha"""
+    caminho_indice = os.path.join(PASTA_FOLHAS, f"turma_{turma}.json")
+    with open(caminho_indice, 'w', encoding='utf-8') as arquivo:
+        json.dump(indice, arquivo, ensure_ascii=False, indent=2)
+
+
+def remover_folha(turma):
+    """Apaga a folha e o índice de uma turma que ficou sem fotos"""
+    for extensao in ('png', 'json'):
+        caminho = os.path.join(PASTA_FOLHAS, f"turma_{turma}.{extensao}")
+        if os.path.exists(caminho):
+            os.remove(caminho)
+            print(f"   🗑️  {caminho} removido (turma sem fotos)")
+
+
+def desenhar_grade(caminho_buffer, fotos, executor):
+    """Pré-aloca o buffer e desenha as fotos em grade; retorna (blocos, falhas)"""
+    colunas = min(COLUNAS, len(fotos))
+    linhas = (len(fotos) + colunas - 1) // colunas
+    largura = colunas * TAMANHO_BLOCO
+    altura = linhas * TAMANHO_BLOCO
+
+    # Pré-aloca o buffer da folha inteira em disco (fundo branco)
+    cabecalho = cabecalho_ppm(largura, altura)
+    with open(caminho_buffer, 'wb') as arquivo:
+        arquivo.write(cabecalho)
+        linha_fundo = bytes([COR_FUNDO]) * (largura * 3)
+        for _ in range(altura):
+            arquivo.write(linha_fundo)
+
+    tarefas = []
+    blocos = {}
+    for i, (nome, caminho_foto) in enumerate(fotos):
+        x = (i % colunas) * TAMANHO_BLOCO
+        y = (i // colunas) * TAMANHO_BLOCO
+        blocos[nome] = {'x': x, 'y': y, 'largura': TAMANHO_BLOCO, 'altura': TAMANHO_BLOCO}
+        tarefas.append((caminho_foto, caminho_buffer, largura, altura, x, y, TAMANHO_BLOCO))
+
+    resultados = list(executor.map(desenhar_bloco, tarefas))
+    falhas = {nome for (nome, _), ok in zip(fotos, resultados) if not ok}
+    return blocos, falhas
+
+
+def gerar_folha_turma(turma, fotos, assinaturas, executor):
+    """Monta a folha de uma turma e grava o índice JSON nome -> posição"""
+    caminho_buffer = os.path.join(PASTA_FOLHAS, f"turma_{turma}.ppm")
+    caminho_folha = os.path.join(PASTA_FOLHAS, f"turma_{turma}.png")
+    total = len(fotos)
+
+    # Refaz a grade só com as fotos que decodificaram, para não deixar buracos
+    falhas = set()
+    while fotos:
+        blocos, novas_falhas = desenhar_grade(caminho_buffer, fotos, executor)
+        if not novas_falhas:
+            break
+        falhas |= novas_falhas
+        fotos = [(nome, caminho) for nome, caminho in fotos if nome not in falhas]
+
+    if not fotos:
+        if os.path.exists(caminho_buffer):
+            os.remove(caminho_buffer)
+        remover_folha(turma)
+        return 0
+
+    # O buffer já é um PPM válido: só converte para PNG
+    with Image.open(caminho_buffer) as imagem:
+        imagem.save(caminho_folha)
+    os.remove(caminho_buffer)
+
+    # Fotos com falha ficam fora das assinaturas: são tentadas de novo na próxima vez
+    indice = {
+        'turma': turma,
+        'folha': os.path.basename(caminho_folha),
+        'tamanho_bloco': TAMANHO_BLOCO,
+        'colunas': COLUNAS,
+        'blocos': blocos,
+        'assinaturas': {nome: a for nome, a in assinaturas.items() if nome not in falhas},
+    }
+    salvar_indice(turma, indice)
+
+    print(f"   ✅ {caminho_folha} ({len(blocos)}/{total} fotos)")
+    return len(blocos)
+
+
+def gerar_folhas_contato():
+    """Gera uma folha de contato por turma, só para turmas com fotos alteradas"""
+    criar_pasta(PASTA_FOLHAS)
+
+    turmas = ler_turmas()
+    if not turmas:
+        print(f"❌ Nenhuma turma encontrada em '{ARQUIVO_TURMAS}'")
+        return
+
+    membros = ler_membros_por_turma()
+    if not membros:
+        print(f"❌ '{ARQUIVO_PESSOAS}' não tem a coluna 'turma' preenchida")
+        print("   Adicione a coluna 'turma' (código de turmas.md, ex: 139) ao CSV")
+        return
+
+    geradas = 0
+    puladas = 0
+
+    with ProcessPoolExecutor() as executor:
+        for turma in turmas:
+            fotos = []
+            for nome in membros.get(turma, []):
+                caminho = localizar_foto(nome)
+                if caminho:
+                    fotos.append((nome, caminho))
+
+            if not fotos:
+                remover_folha(turma)
+                continue
+
+            indice = ler_indice(turma)
+            anteriores = (indice or {}).get('assinaturas') or {}
+            assinaturas = {nome: assinatura_foto(caminho, anteriores.get(nome))
+                           for nome, caminho in fotos}
+            if not precisa_regerar(indice, assinaturas):
+                # Atualiza só as datas no índice, para não recalcular o hash
+                if assinaturas != anteriores:
+                    indice['assinaturas'] = assinaturas
+                    salvar_indice(turma, indice)
+                puladas += 1
+                continue
+
+            print(f"🔹 Turma {turma}: {len(fotos)} fotos")
+            gerar_folha_turma(turma, fotos, assinaturas, executor)
+            geradas += 1
+
+    print(f"\nConcluído: {geradas} folhas geradas, {puladas} sem alterações")
+
+# ============================================================
+# EXECUÇÃO
+# ============================================================
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("FOLHAS DE CONTATO POR TURMA")
+    print("=" * 50)
+    print()
+
+    if not os.path.exists(ARQUIVO_PESSOAS):
+        print(f"❌ Arquivo '{ARQUIVO_PESSOAS}' não encontrado")
+        print("   Crie um arquivo CSV com colunas: nome,linkedin,github,turma")
+        exit(1)
+
+    gerar_folhas_contato()
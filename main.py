@@ -2,6 +2,16 @@ import requests
 import csv
 import os
 import time
+from busca_especulativa import (
+    MODO_ESPECULATIVO,
+    criar_canal,
+    aguardar_canal,
+    baixar_para,
+    disputar_fontes,
+)
+
+# Tentativas do LinkedIn no modo especulativo: uma por vez, com a mesma pausa do loop
+CANAL_LINKEDIN = criar_canal(1)
 
 # ============================================================
 # FUNÇÕES AUXILIARES
@@ -46,7 +56,7 @@ def baixar_imagem(url, nome_arquivo):
 # FUNÇÕES DE DOWNLOAD POR PLATAFORMA
 # ============================================================
 
-def baixar_foto_github(url_github, nome_pessoa):
+def baixar_foto_github(url_github, nome_pessoa, nome_arquivo=None):
     """Baixa foto do perfil do GitHub"""
     # Extrai username da URL
     username = extrair_username_github(url_github)
@@ -57,13 +67,13 @@ def baixar_foto_github(url_github, nome_pessoa):
     url_foto = f"https://avatars.githubusercontent.com/{username}"
     
     # Nome do arquivo
-    nome_arquivo = f"fotos/{nome_pessoa.replace(' ', '_')}.jpg"
+    nome_arquivo = nome_arquivo or f"fotos/{nome_pessoa.replace(' ', '_')}.jpg"
     
     # Baixa e retorna resultado
     return baixar_imagem(url_foto, nome_arquivo)
 
 
-def baixar_foto_linkedin(url_linkedin, nome_pessoa):
+def baixar_foto_linkedin(url_linkedin, nome_pessoa, nome_arquivo=None):
     """Tenta baixar foto do LinkedIn (pode não funcionar sempre)"""
     try:
         # Acessa a página
@@ -79,7 +89,7 @@ def baixar_foto_linkedin(url_linkedin, nome_pessoa):
             
             # Verifica se é uma foto válida (não é o logo padrão)
             if 'static' not in url_foto and 'sharing' not in url_foto:
-                nome_arquivo = f"fotos/{nome_pessoa.replace(' ', '_')}.jpg"
+                nome_arquivo = nome_arquivo or f"fotos/{nome_pessoa.replace(' ', '_')}.jpg"
                 return baixar_imagem(url_foto, nome_arquivo)
         
         return False
@@ -118,17 +128,46 @@ def processar_csv():
         
         sucesso = False
         origem = "nenhum"
+        resultado = {'nome': nome}
+        if MODO_ESPECULATIVO:
+            resultado['tempo_economizado'] = "0.0"
+        
+        # Caminho final da foto: cada tentativa grava num arquivo temporário
+        # e só a que deu certo é movida para cá
+        destino = f"fotos/{nome.replace(' ', '_')}.jpg"
+        
+        # Modo especulativo: as duas fontes ao mesmo tempo
+        especular = (MODO_ESPECULATIVO and linkedin and linkedin != 'none'
+                     and github and github != 'none')
+        if especular:
+            # Valores presos nos argumentos: o LinkedIn abandonado pode terminar
+            # depois que o loop já passou para a próxima pessoa
+            def atualizar_economia(economia, exata, resultado=resultado):
+                resultado['tempo_economizado'] = f"{economia:.1f}" if exata else f">={economia:.1f}"
+            
+            origem, _ = disputar_fontes(
+                CANAL_LINKEDIN,
+                lambda caminho, url=linkedin, nome=nome: baixar_foto_linkedin(url, nome, caminho),
+                lambda caminho, url=github, nome=nome: baixar_foto_github(url, nome, caminho),
+                destino,
+                atualizar_economia,
+            )
+            sucesso = origem != "nenhum"
+            if sucesso:
+                print(f"  ✓ Foto baixada do {origem} (economia: {resultado['tempo_economizado']}s)")
         
         # Tenta LinkedIn primeiro
-        if linkedin and linkedin != 'none':
-            if baixar_foto_linkedin(linkedin, nome):
+        elif linkedin and linkedin != 'none':
+            if baixar_para(destino, 'linkedin',
+                           lambda caminho: baixar_foto_linkedin(linkedin, nome, caminho)):
                 sucesso = True
                 origem = "linkedin"
                 print(f"  ✓ Foto baixada do LinkedIn")
         
         # Se falhou, tenta GitHub
-        if not sucesso and github and github != 'none':
-            if baixar_foto_github(github, nome):
+        if not sucesso and not especular and github and github != 'none':
+            if baixar_para(destino, 'github',
+                           lambda caminho: baixar_foto_github(github, nome, caminho)):
                 sucesso = True
                 origem = "github"
                 print(f"  ✓ Foto baixada do GitHub")
@@ -138,18 +177,21 @@ def processar_csv():
             print(f"  ✗ Nenhuma foto encontrada")
         
         # Guarda resultado
-        resultados.append({
-            'nome': nome,
-            'origem': origem,
-            'sucesso': 'sim' if sucesso else 'nao'
-        })
+        resultado['origem'] = origem
+        resultado['sucesso'] = 'sim' if sucesso else 'nao'
+        resultados.append(resultado)
         
         # Pausa de 1 segundo entre requisições
         time.sleep(1)
     
+    # Espera um LinkedIn abandonado terminar: a economia dele fica exata
+    aguardar_canal(CANAL_LINKEDIN)
+    
     # Salva resultados em CSV
     with open('resultado.csv', 'w', newline='', encoding='utf-8') as arquivo:
         campos = ['nome', 'origem', 'sucesso']
+        if MODO_ESPECULATIVO:
+            campos.append('tempo_economizado')
         escritor = csv.DictWriter(arquivo, fieldnames=campos)
         escritor.writeheader()
         escritor.writerows(resultados)
@@ -167,13 +209,14 @@ def processar_csv():
 def criar_csv_exemplo():
     """Cria arquivo CSV de exemplo"""
     dados = [
-        {'nome': 'Pessoa 1', 'linkedin': 'https://linkedin.com/in/exemplo1', 'github': 'https://github.com/exemplo1'},
-        {'nome': 'Pessoa 2', 'linkedin': 'https://linkedin.com/in/exemplo2', 'github': 'https://github.com/exemplo2'},
-        {'nome': 'Pessoa 3', 'linkedin': 'none', 'github': 'https://github.com/exemplo3'}
+        {'nome': 'Pessoa 1', 'linkedin': 'https://linkedin.com/in/exemplo1', 'github': 'https://github.com/exemplo1', 'turma': '139'},
+        {'nome': 'Pessoa 2', 'linkedin': 'https://linkedin.com/in/exemplo2', 'github': 'https://github.com/exemplo2', 'turma': '139'},
+        {'nome': 'Pessoa 3', 'linkedin': 'none', 'github': 'https://github.com/exemplo3', 'turma': '140'}
     ]
     
     with open('pessoas.csv', 'w', newline='', encoding='utf-8') as arquivo:
-        campos = ['nome', 'linkedin', 'github']
+        # 'turma' agrupa as pessoas nas folhas de contato (ver turmas.md)
+        campos = ['nome', 'linkedin', 'github', 'turma']
         escritor = csv.DictWriter(arquivo, fieldnames=campos)
         escritor.writeheader()
         escritor.writerows(dados)
@@ -0,0 +1,471 @@
+import argparse
+import itertools
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from com_selenium_autentica_login import (
+    criar_pasta_segura,
+    inicializar_selenium_robusto,
+    verificar_sessao_ativa,
+    linkedin_logado,
+    aguardar_linkedin_pendente,
+    fazer_login_linkedin_robusto,
+    ler_pessoas,
+    processar_pessoa,
+)
+
+# ============================================================
+# CONFIGURAÇÕES DO SERVIÇO
+# ============================================================
+
+HOST = '127.0.0.1'
+PORTA = 8765
+
+NUM_NAVEGADORES = 1           # Navegadores mantidos abertos e logados
+MAX_PERFIS_POR_NAVEGADOR = 50  # Recicla o navegador após N perfis (limita memória)
+PASTA_PERFIS_CHROME = 'perfis_chrome'  # Guarda cookies para não logar de novo
+PRIORIDADE_PADRAO = 10        # Menor número = processado antes
+MAX_TRABALHOS_GUARDADOS = 200  # Trabalhos concluídos mantidos para consulta
+TEMPO_ENCERRAMENTO = 60       # Espera máxima pelos workers ao encerrar (segundos)
+
+# ============================================================
+# ESTADO DO SERVIÇO
+# ============================================================
+
+fila = queue.PriorityQueue()
+sequencia = itertools.count()
+contador_trabalhos = itertools.count(1)
+trabalhos = {}
+trabalhos_lock = threading.Lock()
+navegadores = []
+parar = threading.Event()
+
+# ============================================================
+# NAVEGADORES (POOL QUENTE)
+# ============================================================
+
+def criar_navegador(numero, usar_linkedin):
+    """Abre um navegador com perfil próprio e garante o login no LinkedIn"""
+    pasta_perfil = os.path.join(PASTA_PERFIS_CHROME, f"navegador_{numero}")
+    navegador = {
+        'numero': numero,
+        'pasta_perfil': pasta_perfil,
+        'driver': None,
+        'linkedin': False,
+        'perfis': 0,
+    }
+
+    if not usar_linkedin:
+        return navegador
+
+    driver = inicializar_selenium_robusto(pasta_perfil)
+    if not driver:
+        print(f"❌ Navegador {numero}: sem Selenium, só GitHub")
+        return navegador
+
+    navegador['driver'] = driver
+    if linkedin_logado(driver):
+        print(f"✅ Navegador {numero}: sessão do LinkedIn reaproveitada")
+        navegador['linkedin'] = True
+    elif fazer_login_linkedin_robusto(driver):
+        navegador['linkedin'] = True
+    else:
+        print(f"❌ Navegador {numero}: problema no login, só GitHub")
+
+    return navegador
+
+
+def reciclar_navegador(navegador):
+    """Fecha e reabre o navegador reaproveitando o perfil (sem novo login manual)"""
+    print(f"\n♻️  Reciclando navegador {navegador['numero']} "
+          f"após {navegador['perfis']} perfis...")
+
+    driver = navegador['driver']
+    if driver:
+        aguardar_linkedin_pendente(driver)
+    if driver and verificar_sessao_ativa(driver):
+        driver.quit()
+
+    navegador['driver'] = None
+    navegador['linkedin'] = False
+    navegador['perfis'] = 0
+
+    driver = inicializar_selenium_robusto(navegador['pasta_perfil'])
+    if not driver:
+        print(f"❌ Navegador {navegador['numero']}: falha ao reabrir, só GitHub")
+        return
+
+    navegador['driver'] = driver
+    if linkedin_logado(driver):
+        navegador['linkedin'] = True
+    else:
+        print(f"⚠️  Navegador {navegador['numero']}: sessão do LinkedIn perdida, só GitHub")
+
+
+def fechar_navegadores():
+    """Fecha os navegadores cujo worker já parou (sem deslogar, para manter a sessão salva)"""
+    for navegador in navegadores:
+        thread = navegador.get('thread')
+        if thread and thread.is_alive():
+            print(f"⚠️  Navegador {navegador['numero']} ainda em uso, não será fechado")
+            continue
+
+        driver = navegador['driver']
+        if driver:
+            aguardar_linkedin_pendente(driver)
+        if driver and verificar_sessao_ativa(driver):
+            print(f"🔄 Fechando navegador {navegador['numero']}...")
+            driver.quit()
+
+# ============================================================
+# TRABALHOS (JOBS)
+# ============================================================
+
+def criar_trabalho(pessoas, prioridade):
+    """Registra um trabalho e coloca cada pessoa na fila de prioridade"""
+    with trabalhos_lock:
+        id_trabalho = f"t{next(contador_trabalhos)}"
+        trabalhos[id_trabalho] = {
+            'id': id_trabalho,
+            'prioridade': prioridade,
+            'total': len(pessoas),
+            'resultados': [],
+            'criado_em': time.time(),
+            'condicao': threading.Condition(),
+        }
+        limpar_trabalhos_antigos()
+
+    for indice, pessoa in enumerate(pessoas):
+        fila.put((prioridade, next(sequencia), id_trabalho, indice, pessoa))
+
+    print(f"📥 Trabalho {id_trabalho}: {len(pessoas)} pessoas (prioridade {prioridade})")
+    return trabalhos[id_trabalho]
+
+
+def limpar_trabalhos_antigos():
+    """Descarta os trabalhos concluídos mais antigos (chamar com o lock)"""
+    concluidos = [t for t in trabalhos.values() if len(t['resultados']) >= t['total']]
+    excesso = len(concluidos) - MAX_TRABALHOS_GUARDADOS
+    for trabalho in sorted(concluidos, key=lambda t: t['criado_em'])[:max(excesso, 0)]:
+        del trabalhos[trabalho['id']]
+
+
+def registrar_resultado(id_trabalho, indice, resultado):
+    """Guarda o resultado de uma linha e avisa quem está acompanhando"""
+    with trabalhos_lock:
+        trabalho = trabalhos.get(id_trabalho)
+    if not trabalho:
+        return
+
+    with trabalho['condicao']:
+        trabalho['resultados'].append(dict(resultado, indice=indice))
+        trabalho['condicao'].notify_all()
+
+
+def acompanhar_trabalho(trabalho):
+    """Gera os resultados de um trabalho conforme vão ficando prontos"""
+    enviados = 0
+    while True:
+        with trabalho['condicao']:
+            while enviados == len(trabalho['resultados']) and enviados < trabalho['total']:
+                trabalho['condicao'].wait()
+            novos = trabalho['resultados'][enviados:]
+
+        for resultado in novos:
+            yield resultado
+        enviados += len(novos)
+
+        if enviados >= trabalho['total']:
+            return
+
+
+def cancelar_fila_pendente():
+    """Esvazia a fila e marca as linhas não processadas como canceladas"""
+    while True:
+        try:
+            _, _, id_trabalho, indice, pessoa = fila.get_nowait()
+        except queue.Empty:
+            return
+        if id_trabalho is not None:
+            registrar_resultado(id_trabalho, indice, resultado_cancelado(pessoa))
+        fila.task_done()
+
+
+def resultado_cancelado(pessoa):
+    """Resultado de uma linha descartada no encerramento do serviço"""
+    return {'nome': pessoa.get('nome', ''), 'origem': 'nenhum', 'sucesso': 'nao', 'cancelado': True}
+
+
+def resumo_trabalho(trabalho):
+    """Resumo serializável de um trabalho"""
+    with trabalho['condicao']:
+        resultados = list(trabalho['resultados'])
+    return {
+        'id': trabalho['id'],
+        'prioridade': trabalho['prioridade'],
+        'total': trabalho['total'],
+        'concluidos': len(resultados),
+        'resultados': resultados,
+    }
+
+# ============================================================
+# WORKERS
+# ============================================================
+
+def worker(navegador):
+    """Consome a fila usando sempre o mesmo navegador já aberto"""
+    while True:
+        _, _, id_trabalho, indice, pessoa = fila.get()
+        if id_trabalho is None:
+            fila.task_done()
+            return
+
+        if parar.is_set():
+            registrar_resultado(id_trabalho, indice, resultado_cancelado(pessoa))
+            fila.task_done()
+            continue
+
+        try:
+            # O intervalo entre perfis do LinkedIn é respeitado pelo canal do navegador
+            usar_linkedin = navegador['linkedin'] and pessoa['linkedin'].startswith('http')
+
+            print(f"\n🔹 [{id_trabalho}#{indice}] {pessoa['nome']}")
+            resultado = processar_pessoa(pessoa, navegador['driver'], usar_linkedin)
+
+            if usar_linkedin:
+                navegador['perfis'] += 1
+                if navegador['perfis'] >= MAX_PERFIS_POR_NAVEGADOR:
+                    reciclar_navegador(navegador)
+
+        except Exception as e:
+            print(f"   ❌ Erro no worker: {e}")
+            resultado = {'nome': pessoa.get('nome', ''), 'origem': 'nenhum', 'sucesso': 'nao'}
+
+        registrar_resultado(id_trabalho, indice, resultado)
+        fila.task_done()
+
+# ============================================================
+# API HTTP
+# ============================================================
+
+def ler_prioridade(valor):
+    """Aceita só inteiros (não bool) ou texto numérico, ex: 3 ou '3'"""
+    if valor is None:
+        return PRIORIDADE_PADRAO
+    if isinstance(valor, bool) or not isinstance(valor, (int, str)):
+        raise ValueError(f"prioridade deve ser um número inteiro: {valor!r}")
+    return int(valor)
+
+
+def ler_pedido(corpo, tipo_conteudo):
+    """Extrai pessoas e prioridade de um corpo CSV ou JSON"""
+    texto = corpo.decode('utf-8')
+
+    if 'json' in tipo_conteudo:
+        dados = json.loads(texto)
+        if isinstance(dados, list):
+            dados = {'pessoas': dados}
+        if not isinstance(dados, dict) or not isinstance(dados.get('pessoas', []), list):
+            raise ValueError("esperado {'pessoas': [...]} ou uma lista de linhas")
+
+        pessoas = []
+        for linha in dados.get('pessoas', []):
+            # Linha como lista segue a ordem do CSV: nome, linkedin, github
+            if isinstance(linha, list):
+                linha = dict(zip(['nome', 'linkedin', 'github'], linha))
+            if not isinstance(linha, dict):
+                raise ValueError(f"linha inválida: {linha!r}")
+
+            nome = str(linha.get('nome') or '').strip()
+            if nome:
+                pessoas.append({
+                    'nome': nome,
+                    'linkedin': str(linha.get('linkedin') or '').strip(),
+                    'github': str(linha.get('github') or '').strip(),
+                })
+        return pessoas, dados.get('prioridade')
+
+    linhas = texto.splitlines()
+    return (ler_pessoas(linhas) if linhas else []), None
+
+
+class ManipuladorFotos(BaseHTTPRequestHandler):
+    """
+    POST /trabalhos            corpo CSV (nome,linkedin,github) ou JSON
+                               ?prioridade=N  ?stream=1 (resultados em NDJSON)
+    GET  /trabalhos/<id>       situação e resultados do trabalho
+    GET  /trabalhos/<id>/stream  resultados em NDJSON conforme ficam prontos
+    GET  /status               fila e navegadores
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def address_string(self):
+        # Em socket Unix o client_address não é (host, porta)
+        if isinstance(self.client_address, tuple) and self.client_address:
+            return self.client_address[0]
+        return 'unix'
+
+    def responder_json(self, codigo, dados):
+        corpo = json.dumps(dados, ensure_ascii=False).encode('utf-8')
+        self.send_response(codigo)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def responder_stream(self, trabalho):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('X-Trabalho', trabalho['id'])
+        self.end_headers()
+
+        def enviar(dados):
+            linha = (json.dumps(dados, ensure_ascii=False) + '\n').encode('utf-8')
+            self.wfile.write(f"{len(linha):X}\r\n".encode('ascii') + linha + b"\r\n")
+            self.wfile.flush()
+
+        for resultado in acompanhar_trabalho(trabalho):
+            enviar(resultado)
+        enviar({'fim': True, 'id': trabalho['id'], 'total': trabalho['total']})
+        self.wfile.write(b"0\r\n\r\n")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        parametros = parse_qs(url.query)
+
+        if url.path.rstrip('/') != '/trabalhos':
+            self.responder_json(404, {'erro': 'rota não encontrada'})
+            return
+
+        try:
+            tamanho = int(self.headers.get('Content-Length', 0))
+            corpo = self.rfile.read(tamanho)
+            pessoas, prioridade = ler_pedido(corpo, self.headers.get('Content-Type', ''))
+            if 'prioridade' in parametros:
+                prioridade = parametros['prioridade'][0]
+            prioridade = ler_prioridade(prioridade)
+        except (ValueError, TypeError, OverflowError, UnicodeDecodeError) as e:
+            self.responder_json(400, {'erro': f'pedido inválido: {e}'})
+            return
+
+        if not pessoas:
+            self.responder_json(400, {'erro': 'nenhuma pessoa no pedido'})
+            return
+
+        trabalho = criar_trabalho(pessoas, prioridade)
+
+        if parametros.get('stream', ['0'])[0] == '1':
+            self.responder_stream(trabalho)
+        else:
+            self.responder_json(202, {'id': trabalho['id'], 'total': trabalho['total']})
+
+    def do_GET(self):
+        partes = [p for p in urlparse(self.path).path.split('/') if p]
+
+        if partes == ['status']:
+            self.responder_json(200, {
+                'fila': fila.qsize(),
+                'navegadores': [
+                    {'numero': n['numero'], 'linkedin': n['linkedin'], 'perfis': n['perfis']}
+                    for n in navegadores
+                ],
+            })
+            return
+
+        if len(partes) in (2, 3) and partes[0] == 'trabalhos':
+            with trabalhos_lock:
+                trabalho = trabalhos.get(partes[1])
+            if not trabalho:
+                self.responder_json(404, {'erro': 'trabalho não encontrado'})
+            elif len(partes) == 3 and partes[2] == 'stream':
+                self.responder_stream(trabalho)
+            elif len(partes) == 2:
+                self.responder_json(200, resumo_trabalho(trabalho))
+            else:
+                self.responder_json(404, {'erro': 'rota não encontrada'})
+            return
+
+        self.responder_json(404, {'erro': 'rota não encontrada'})
+
+
+class ServidorUnix(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Mesmo servidor HTTP, mas escutando em um socket Unix"""
+    daemon_threads = True
+
+# ============================================================
+# EXECUÇÃO DO SERVIÇO
+# ============================================================
+
+def iniciar_servico(host=HOST, porta=PORTA, socket_unix=None,
+                    num_navegadores=NUM_NAVEGADORES, usar_linkedin=True):
+    """Abre os navegadores, inicia os workers e atende a API até Ctrl+C"""
+    if not criar_pasta_segura('fotos'):
+        return
+
+    # Login feito uma vez só, aqui, antes de aceitar trabalhos
+    for numero in range(1, num_navegadores + 1):
+        navegadores.append(criar_navegador(numero, usar_linkedin))
+
+    for navegador in navegadores:
+        thread = threading.Thread(target=worker, args=(navegador,), daemon=True)
+        navegador['thread'] = thread
+        thread.start()
+
+    if socket_unix:
+        if os.path.exists(socket_unix):
+            os.remove(socket_unix)
+        servidor = ServidorUnix(socket_unix, ManipuladorFotos)
+        print(f"\n🟢 Serviço escutando em unix:{socket_unix}")
+    else:
+        servidor = ThreadingHTTPServer((host, porta), ManipuladorFotos)
+        print(f"\n🟢 Serviço escutando em http://{host}:{porta}")
+
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Encerrando serviço...")
+    finally:
+        servidor.server_close()
+        if socket_unix and os.path.exists(socket_unix):
+            os.remove(socket_unix)
+        # Descarta o que ainda não começou e acorda os workers parados na fila
+        parar.set()
+        cancelar_fila_pendente()
+        for _ in navegadores:
+            fila.put((float('-inf'), next(sequencia), None, None, None))
+
+        # Só fecha o navegador depois que o worker dele terminou a linha atual
+        limite = time.time() + TEMPO_ENCERRAMENTO
+        for navegador in navegadores:
+            navegador['thread'].join(timeout=max(limite - time.time(), 0))
+        fechar_navegadores()
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("📸 SERVIÇO DE FOTOS - NAVEGADORES SEMPRE PRONTOS")
+    print("=" * 70)
+    print()
+
+    parser = argparse.ArgumentParser(description="Serviço residente de download de fotos")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--porta', type=int, default=PORTA)
+    parser.add_argument('--socket', help="Escuta em um socket Unix em vez de TCP")
+    parser.add_argument('--navegadores', type=int, default=NUM_NAVEGADORES)
+    parser.add_argument('--max-perfis', type=int, default=MAX_PERFIS_POR_NAVEGADOR,
+                        help="Recicla cada navegador após N perfis do LinkedIn")
+    parser.add_argument('--sem-linkedin', action='store_true',
+                        help="Não abre navegadores; usa só o GitHub")
+    args = parser.parse_args()
+
+    MAX_PERFIS_POR_NAVEGADOR = args.max_perfis
+
+    iniciar_servico(args.host, args.porta, args.socket,
+                    args.navegadores, not args.sem_linkedin)